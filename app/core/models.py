@@ -62,6 +62,16 @@ class Recipe(models.Model):
     link = models.CharField(max_length=255, blank=True)
     tags = models.ManyToManyField("Tag")
     ingredients = models.ManyToManyField("Ingredient")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-id"]
+        indexes = [
+            models.Index(
+                fields=["user", "-id"],
+                name="recipe_user_id_desc_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -76,6 +86,15 @@ class Tag(models.Model):
         on_delete=models.CASCADE,
     )
 
+    class Meta:
+        ordering = ["-name"]
+        indexes = [
+            models.Index(
+                fields=["user", "name"],
+                name="tag_user_name_idx",
+            ),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -89,5 +108,14 @@ class Ingredient(models.Model):
         on_delete=models.CASCADE,
     )
 
+    class Meta:
+        ordering = ["-name"]
+        indexes = [
+            models.Index(
+                fields=["user", "name"],
+                name="ingredient_user_name_idx",
+            ),
+        ]
+
     def __str__(self):
         return self.name
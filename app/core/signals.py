@@ -0,0 +1,25 @@
+"""
+Signal handlers for core models
+"""
+
+from django.db.models.signals import post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core.models import Tag, Ingredient
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_save, sender=Ingredient)
+def touch_recipes_on_save(sender, instance, created, **kwargs):
+    """Bump updated_at on recipes using a changed tag or ingredient"""
+    if not created:
+        instance.recipe_set.update(updated_at=timezone.now())
+
+
+@receiver(pre_delete, sender=Tag)
+@receiver(pre_delete, sender=Ingredient)
+def touch_recipes_on_delete(sender, instance, **kwargs):
+    """Bump updated_at on recipes using a tag or ingredient being deleted"""
+    # Runs before the delete so the recipe links still exist.
+    instance.recipe_set.update(updated_at=timezone.now())
@@ -60,11 +60,8 @@ class ModelTests(TestCase):
 
     def test_create_recipe(self):
         """Test creatiing a recipe is successful"""
-        user = get_user_model().objects.create_superuser(
-            "test@example.com",
-            "pass123",
-        )
-        recipe = models.Recipe.objects.create(
+        user = get_user_model()(email="test@example.com")
+        recipe = models.Recipe(
             user=user,
             title="Sample Recipe",
             duration=300,
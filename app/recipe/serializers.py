@@ -2,6 +2,10 @@
 Serializers for recipe APIs
 """
 
+from copy import deepcopy
+
+from django.db import transaction
+
 from rest_framework import serializers
 from core.models import (
     Recipe,
@@ -10,7 +14,24 @@ from core.models import (
 )
 
 
-class IngredientSerializer(serializers.ModelSerializer):
+class CachedFieldsModelSerializer(serializers.ModelSerializer):
+    """Model serializer that builds its fields once per class"""
+
+    _fields_cache = {}
+
+    def get_fields(self):
+        """Return a fresh copy of the fields built for this class"""
+        cls = type(self)
+        if cls not in self._fields_cache:
+            self._fields_cache[cls] = super().get_fields()
+
+        return {
+            name: deepcopy(field)
+            for name, field in self._fields_cache[cls].items()
+        }
+
+
+class IngredientSerializer(CachedFieldsModelSerializer):
     """Serializer for ingredients"""
 
     class Meta:
@@ -19,7 +40,7 @@ class IngredientSerializer(serializers.ModelSerializer):
         read_only_fields = ["id"]
 
 
-class TagSerializer(serializers.ModelSerializer):
+class TagSerializer(CachedFieldsModelSerializer):
     """Serializer for tags"""
 
     class Meta:
@@ -28,7 +49,7 @@ class TagSerializer(serializers.ModelSerializer):
         read_only_fields = ["id"]
 
 
-class RecipeSerializer(serializers.ModelSerializer):
+class RecipeSerializer(CachedFieldsModelSerializer):
     """Serializer for recipes"""
 
     tags = TagSerializer(many=True, required=False)
@@ -47,33 +68,39 @@ class RecipeSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["id"]
 
-    def _get_or_create_tags(self, tags, recipe):
-        """Handle getting or creating a tag"""
-        auth_user = self.context["request"].user
-        for tag in tags:
-            tag_obj, created = Tag.objects.get_or_create(
-                user=auth_user,
-                **tag,
-            )
-            recipe.tags.add(tag_obj)
-
-    def _get_or_create_ingredients(self, ingredients, recipe):
-        """Handle getting or creating ingredients as needed"""
+    def _get_or_create_objects(self, model, items):
+        """Get or create the named objects for the auth user in bulk"""
         auth_user = self.context["request"].user
-        for ingredient in ingredients:
-            ingredient_obj, create = Ingredient.objects.get_or_create(
-                user=auth_user,
-                **ingredient,
-            )
-            recipe.ingredients.add(ingredient_obj)
+        names = list(dict.fromkeys(item["name"] for item in items))
+        existing = {
+            obj.name: obj
+            for obj in model.objects.filter(user=auth_user, name__in=names)
+        }
+        created = model.objects.bulk_create(
+            model(user=auth_user, name=name)
+            for name in names
+            if name not in existing
+        )
+
+        return [*existing.values(), *created]
 
     def create(self, validated_data):
         """Create a recipe"""
         tags = validated_data.pop("tags", [])
         ingredients = validated_data.pop("ingredients", [])
-        recipe = Recipe.objects.create(**validated_data)
-        self._get_or_create_tags(tags, recipe)
-        self._get_or_create_ingredients(ingredients, recipe)
+        if not tags and not ingredients:
+            return Recipe.objects.create(**validated_data)
+
+        # Commit the recipe together with its links so a concurrent list
+        # request never caches the new recipe without its tags.
+        with transaction.atomic():
+            recipe = Recipe.objects.create(**validated_data)
+            if tags:
+                recipe.tags.add(*self._get_or_create_objects(Tag, tags))
+            if ingredients:
+                recipe.ingredients.add(
+                    *self._get_or_create_objects(Ingredient, ingredients)
+                )
 
         return recipe
 
@@ -81,13 +108,13 @@ class RecipeSerializer(serializers.ModelSerializer):
         """Update a recipe"""
         tags = validated_data.pop("tags", None)
         if tags is not None:
-            instance.tags.clear()
-            self._get_or_create_tags(tags, instance)
+            instance.tags.set(self._get_or_create_objects(Tag, tags))
 
         ingredients = validated_data.pop("ingredients", None)
         if ingredients is not None:
-            instance.ingredients.clear()
-            self._get_or_create_ingredients(ingredients, instance)
+            instance.ingredients.set(
+                self._get_or_create_objects(Ingredient, ingredients)
+            )
 
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
@@ -5,7 +5,10 @@ Tests for recipe API
 from decimal import Decimal
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from rest_framework.test import APIClient
@@ -23,6 +26,14 @@ from recipe.serializers import RecipeSerializer, RecipeDetailSerializer
 
 RECIPES_URL = reverse("recipe:recipe-list")
 
+RECIPE_DEFAULTS = {
+    "title": "Jellof rice recipe",
+    "duration": 1800,
+    "price": Decimal("10.5"),
+    "description": "Jellof rice is a perfect sample recipe",
+    "link": "http://example.com/jellofrecipe.pdf",
+}
+
 
 def detail_url(recipe_id):
     """create and return a recipe detail url"""
@@ -31,14 +42,7 @@ def detail_url(recipe_id):
 
 def create_recipe(user, **params):
     """Create and return a sample recipe"""
-    defaults = {
-        "title": "Jellof rice recipe",
-        "duration": 1800,
-        "price": Decimal("10.5"),
-        "description": "Jellof rice is a perfect sample recipe",
-        "link": "http://example.com/jellofrecipe.pdf",
-    }
-    defaults.update(params)
+    defaults = {**RECIPE_DEFAULTS, **params}
 
     recipe = Recipe.objects.create(user=user, **defaults)
     return recipe
@@ -49,11 +53,10 @@ def create_user(**params):
     return get_user_model().objects.create_user(**params)
 
 
-class PublicRecipeAPITests(TestCase):
+class PublicRecipeAPITests(SimpleTestCase):
     """Test unauthenticated Recipe API requests"""
 
-    def setUp(self):
-        self.client = APIClient()
+    client_class = APIClient
 
     def test_auth_required(self):
         """Test that authentication is required to test API"""
@@ -65,12 +68,17 @@ class PublicRecipeAPITests(TestCase):
 class PrivateRecipeAPITests(TestCase):
     """Test authenticated Recipe API requests"""
 
-    def setUp(self):
-        self.client = APIClient()
-        self.user = create_user(
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(
             email="user@test.com",
             password="testpass123",
         )
+
+    def setUp(self):
+        cache.clear()
         self.client.force_authenticate(self.user)
 
     def test_retrieve_all_recipes(self):
@@ -87,10 +95,7 @@ class PrivateRecipeAPITests(TestCase):
 
     def test_retrieve_user_recipes_(self):
         """Test get a list of recipes limited to the auth user"""
-        other_user = create_user(
-            email="otheruser@test.com",
-            password="testpass123",
-        )
+        other_user = create_user(email="otheruser@test.com")
         create_recipe(user=other_user)
         create_recipe(user=self.user)
 
@@ -102,6 +107,146 @@ class PrivateRecipeAPITests(TestCase):
         self.assertEqual(res.status_code, HTTP_200_OK)
         self.assertEqual(res.data, serializer.data)
 
+    def test_retrieve_recipes_query_count(self):
+        """Test listing recipes does not query tags/ingredients per recipe"""
+        for _ in range(3):
+            recipe = create_recipe(user=self.user)
+            recipe.tags.create(user=self.user, name="Dinner")
+            recipe.ingredients.create(user=self.user, name="Salt")
+
+        # Cache stamp, then one query each for recipes, tags and ingredients.
+        with self.assertNumQueries(4):
+            res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res.status_code, HTTP_200_OK)
+        self.assertEqual(len(res.data), 3)
+
+    def test_retrieve_recipes_defers_description(self):
+        """Test listing recipes does not load the recipe description"""
+        create_recipe(user=self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res.status_code, HTTP_200_OK)
+        for query in queries:
+            self.assertNotIn("description", query["sql"])
+
+    def test_retrieve_recipes_cached(self):
+        """Test repeated recipe lists are served from the cache"""
+        create_recipe(user=self.user)
+        res = self.client.get(RECIPES_URL)
+
+        # Only the cache stamp query is needed on a cache hit.
+        with self.assertNumQueries(1):
+            cached_res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(cached_res.status_code, HTTP_200_OK)
+        self.assertEqual(cached_res.data, res.data)
+
+    def test_retrieve_recipes_after_update(self):
+        """Test updating a recipe expires the cached recipe list"""
+        recipe = create_recipe(user=self.user, title="Old title")
+        self.client.get(RECIPES_URL)
+
+        self.client.patch(detail_url(recipe.id), {"title": "New title"})
+        res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res.data[0]["title"], "New title")
+
+    def test_retrieve_recipes_after_create_with_tags(self):
+        """Test a recipe created with tags is listed with its tags"""
+        self.client.get(RECIPES_URL)
+        payload = {
+            "title": "Thai prawn curry",
+            "duration": 3600,
+            "price": Decimal("12.5"),
+            "tags": [{"name": "Thai"}],
+            "ingredients": [{"name": "Prawns"}],
+        }
+
+        self.client.post(RECIPES_URL, payload)
+        res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res.data[0]["tags"][0]["name"], "Thai")
+        self.assertEqual(res.data[0]["ingredients"][0]["name"], "Prawns")
+
+    def test_retrieve_recipes_after_tag_update(self):
+        """Test renaming a tag expires the cached recipe list"""
+        recipe = create_recipe(user=self.user)
+        tag = recipe.tags.create(user=self.user, name="Lunch")
+        self.client.get(RECIPES_URL)
+
+        tag_url = reverse("recipe:tag-detail", args=[tag.id])
+        self.client.patch(tag_url, {"name": "Brunch"})
+        res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res.data[0]["tags"][0]["name"], "Brunch")
+
+    def test_retrieve_recipes_after_tag_save(self):
+        """Test renaming a tag outside the API expires the recipe list"""
+        recipe = create_recipe(user=self.user)
+        tag = recipe.tags.create(user=self.user, name="Lunch")
+        self.client.get(RECIPES_URL)
+
+        tag.name = "Brunch"
+        tag.save()
+        res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res.data[0]["tags"][0]["name"], "Brunch")
+
+    def test_retrieve_recipes_after_tag_delete(self):
+        """Test deleting a tag expires the cached recipe list"""
+        recipe = create_recipe(user=self.user)
+        tag = recipe.tags.create(user=self.user, name="Lunch")
+        self.client.get(RECIPES_URL)
+
+        self.client.delete(reverse("recipe:tag-detail", args=[tag.id]))
+        res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res.data[0]["tags"], [])
+
+    def test_retrieve_recipes_after_ingredient_update(self):
+        """Test renaming an ingredient expires the cached recipe list"""
+        recipe = create_recipe(user=self.user)
+        ingredient = recipe.ingredients.create(user=self.user, name="Salt")
+        self.client.get(RECIPES_URL)
+
+        ingredient_url = reverse(
+            "recipe:ingredient-detail",
+            args=[ingredient.id],
+        )
+        self.client.patch(ingredient_url, {"name": "Sea salt"})
+        res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res.data[0]["ingredients"][0]["name"], "Sea salt")
+
+    def test_retrieve_recipes_after_ingredient_delete(self):
+        """Test deleting an ingredient expires the cached recipe list"""
+        recipe = create_recipe(user=self.user)
+        ingredient = recipe.ingredients.create(user=self.user, name="Salt")
+        self.client.get(RECIPES_URL)
+
+        ingredient_url = reverse(
+            "recipe:ingredient-detail",
+            args=[ingredient.id],
+        )
+        self.client.delete(ingredient_url)
+        res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res.data[0]["ingredients"], [])
+
+    def test_retrieve_recipes_after_delete(self):
+        """Test deleting a recipe expires the cached recipe list"""
+        create_recipe(user=self.user, title="Kept")
+        recipe = create_recipe(user=self.user, title="Deleted")
+        self.client.get(RECIPES_URL)
+
+        self.client.delete(detail_url(recipe.id))
+        res = self.client.get(RECIPES_URL)
+
+        self.assertEqual([r["title"] for r in res.data], ["Kept"])
+
     def test_get_recipe_detail(self):
         """Test get details of a recipe"""
         recipe = create_recipe(user=self.user)
@@ -129,6 +274,20 @@ class PrivateRecipeAPITests(TestCase):
             self.assertEqual(getattr(recipe, k), v)
         self.assertEqual(recipe.user, self.user)
 
+    def test_create_recipe_query_count(self):
+        """Test creating a recipe without tags or ingredients stays cheap"""
+        payload = {
+            "title": "Sample recipe",
+            "duration": 1200,
+            "price": Decimal("5.99"),
+        }
+
+        # Recipe INSERT, then the response reads tags and ingredients.
+        with self.assertNumQueries(3):
+            res = self.client.post(RECIPES_URL, payload)
+
+        self.assertEqual(res.status_code, HTTP_201_CREATED)
+
     def test_partial_update_recipe(self):
         """Test partial update of a created recipe"""
         original_link = "https://example.com/recipe.pdf"
@@ -173,12 +332,22 @@ class PrivateRecipeAPITests(TestCase):
             self.assertEqual(getattr(recipe, k), v)
         self.assertEqual(recipe.user, self.user)
 
+    def test_partial_update_recipe_query_count(self):
+        """Test updating a recipe does not prefetch unused relations"""
+        recipe = create_recipe(user=self.user)
+
+        # Fetch, UPDATE, then the response reads tags and ingredients.
+        with self.assertNumQueries(4):
+            res = self.client.patch(
+                detail_url(recipe.id),
+                {"title": "New title"},
+            )
+
+        self.assertEqual(res.status_code, HTTP_200_OK)
+
     def test_update_user_returns_error(self):
         """Test changing the recipe user returns error"""
-        new_user = create_user(
-            email="newuser@test.com",
-            password="testpass123",
-        )
+        new_user = create_user(email="newuser@test.com")
         recipe = create_recipe(user=self.user)
         payload = {"user": new_user.id}
 
@@ -198,12 +367,19 @@ class PrivateRecipeAPITests(TestCase):
         self.assertEqual(res.status_code, HTTP_204_NO_CONTENT)
         self.assertFalse(Recipe.objects.filter(id=recipe.id).exists())
 
+    def test_delete_recipe_query_count(self):
+        """Test deleting a recipe does not prefetch unused relations"""
+        recipe = create_recipe(user=self.user)
+
+        # Fetch, clear tag and ingredient links, then DELETE the recipe.
+        with self.assertNumQueries(4):
+            res = self.client.delete(detail_url(recipe.id))
+
+        self.assertEqual(res.status_code, HTTP_204_NO_CONTENT)
+
     def test_delete_other_user_recipe(self):
         """Test deleting another user's recipe is unsuccessful"""
-        new_user = create_user(
-            email="newuser@test.com",
-            password="testpass123",
-        )
+        new_user = create_user(email="newuser@test.com")
         recipe = create_recipe(user=new_user)
 
         url = detail_url(recipe.id)
@@ -232,12 +408,12 @@ class PrivateRecipeAPITests(TestCase):
         self.assertEqual(recipes.count(), 1)
         recipe = recipes[0]
         self.assertEqual(recipe.tags.count(), 2)
-        for tag in payload["tags"]:
-            exists = recipe.tags.filter(
-                name=tag["name"],
-                user=self.user,
-            ).exists()
-            self.assertTrue(exists)
+        tag_names = recipe.tags.filter(user=self.user).values_list(
+            "name",
+            flat=True,
+        )
+        expected_names = {tag["name"] for tag in payload["tags"]}
+        self.assertEqual(set(tag_names), expected_names)
 
     def test_create_recipe_with_existing_tags(self):
         """Test creating a new recipe with an existing tag"""
@@ -271,12 +447,31 @@ class PrivateRecipeAPITests(TestCase):
 
         self.assertIn(indian_tag, recipe.tags.all())
 
-        for tag in payload["tags"]:
-            exists = recipe.tags.filter(
-                name=tag["name"],
-                user=self.user,
-            ).exists()
-            self.assertTrue(exists)
+        tag_names = recipe.tags.filter(user=self.user).values_list(
+            "name",
+            flat=True,
+        )
+        expected_names = {tag["name"] for tag in payload["tags"]}
+        self.assertEqual(set(tag_names), expected_names)
+
+    def test_create_recipe_with_duplicate_tags(self):
+        """Test repeated tag names in a payload create a single tag"""
+        payload = {
+            "title": "Pancakes",
+            "duration": 900,
+            "price": Decimal("3.5"),
+            "tags": [
+                {"name": "Breakfast"},
+                {"name": "Breakfast"},
+            ],
+        }
+
+        res = self.client.post(RECIPES_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, HTTP_201_CREATED)
+        recipe = Recipe.objects.get(id=res.data["id"])
+        self.assertEqual(recipe.tags.count(), 1)
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 1)
 
     def test_create_tag_on_update(self):
         """Test creating a tag during recipe update"""
@@ -353,11 +548,11 @@ class PrivateRecipeAPITests(TestCase):
         self.assertEqual(recipes.count(), 1)
         recipe = recipes[0]
         self.assertEqual(recipe.ingredients.count(), 2)
-        for ingredient in payload["ingredients"]:
-            exists = recipe.ingredients.filter(
-                name=ingredient["name"], user=self.user
-            ).exists()
-            self.assertTrue(exists)
+        ingredient_names = recipe.ingredients.filter(
+            user=self.user,
+        ).values_list("name", flat=True)
+        expected_names = {item["name"] for item in payload["ingredients"]}
+        self.assertEqual(set(ingredient_names), expected_names)
 
     def test_create_recipe_with_existing_ingredients(self):
         """Test creating a new recipe with existing ingredients"""
@@ -383,11 +578,12 @@ class PrivateRecipeAPITests(TestCase):
         self.assertEqual(recipes.count(), 1)
         recipe = recipes[0]
         self.assertEqual(recipe.ingredients.count(), 2)
-        for ingredient in payload["ingredients"]:
-            exists = recipe.ingredients.filter(
-                name=ingredient["name"], user=self.user
-            ).exists()
-            self.assertTrue(exists)
+        self.assertIn(ingredient, recipe.ingredients.all())
+        ingredient_names = recipe.ingredients.filter(
+            user=self.user,
+        ).values_list("name", flat=True)
+        expected_names = {item["name"] for item in payload["ingredients"]}
+        self.assertEqual(set(ingredient_names), expected_names)
 
     def test_create_ingredient_on_update(self):
         """Test creating an ingredient when updating a recipe"""
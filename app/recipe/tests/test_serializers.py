@@ -0,0 +1,36 @@
+"""
+Tests for recipe serializers
+"""
+
+from django.test import SimpleTestCase
+
+from recipe.serializers import RecipeDetailSerializer
+
+
+class CachedFieldsModelSerializerTests(SimpleTestCase):
+    """Test serializer fields cached per class"""
+
+    def test_instances_do_not_share_fields(self):
+        """Test each serializer instance gets its own field objects"""
+        first = RecipeDetailSerializer()
+        second = RecipeDetailSerializer()
+
+        self.assertIsNot(first.fields["title"], second.fields["title"])
+        self.assertIsNot(
+            first.fields["tags"].child,
+            second.fields["tags"].child,
+        )
+
+    def test_field_changes_do_not_leak(self):
+        """Test changing one instance's fields leaves new instances intact"""
+        serializer = RecipeDetailSerializer()
+        serializer.fields["title"].label = "Changed"
+        serializer.fields["tags"].child.label = "Changed"
+
+        new_serializer = RecipeDetailSerializer()
+
+        self.assertNotEqual(new_serializer.fields["title"].label, "Changed")
+        self.assertNotEqual(
+            new_serializer.fields["tags"].child.label,
+            "Changed",
+        )
@@ -1,5 +1,5 @@
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 from django.urls import reverse
 
 from rest_framework import status
@@ -22,11 +22,10 @@ def create_user(email="user@test.com", password="testpass123"):
     return get_user_model().objects.create_user(email, password)
 
 
-class PublicTagAPITests(TestCase):
+class PublicTagAPITests(SimpleTestCase):
     """Test unauthenticated Tag API requests"""
 
-    def setUp(self):
-        self.client = APIClient()
+    client_class = APIClient
 
     def test_auth_required(self):
         """Test that authentication is required to test API"""
@@ -38,9 +37,13 @@ class PublicTagAPITests(TestCase):
 class PrivateTagAPITests(TestCase):
     """Test authenticated Tag API requests"""
 
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+
     def setUp(self):
-        self.user = create_user()
-        self.client = APIClient()
         self.client.force_authenticate(self.user)
 
     def test_retrive_tags(self):
@@ -57,7 +60,7 @@ class PrivateTagAPITests(TestCase):
 
     def test_tags_limited_to_user(self):
         """Test list of tags is limited to authenticated user"""
-        user2 = create_user(email="user2@test.com")
+        user2 = create_user(email="user2@test.com", password=None)
         Tag.objects.create(user=user2, name="Fruity")
         tag = Tag.objects.create(user=self.user, name="Veggies")
 
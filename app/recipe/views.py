@@ -2,9 +2,13 @@
 Views for the Recipe APIs
 """
 
+from django.core.cache import cache
+from django.db.models import Count, Max
+
 from rest_framework import viewsets, mixins
 from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
 from recipe import serializers
 from core.models import (
@@ -13,6 +17,8 @@ from core.models import (
     Ingredient,
 )
 
+RECIPE_LIST_CACHE_TIMEOUT = 300
+
 
 class RecipeViewSet(viewsets.ModelViewSet):
     """View for managing recipe APIs"""
@@ -24,7 +30,41 @@ class RecipeViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Retrieve recipes for authenticated user."""
-        return self.queryset.filter(user=self.request.user).order_by("-id")
+        queryset = self.queryset.filter(user=self.request.user)
+        if self.action in ("list", "retrieve"):
+            queryset = queryset.prefetch_related("tags", "ingredients")
+        if self.action == "list":
+            queryset = queryset.defer("description")
+
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        """List recipes, reusing cached data until the user's recipes change"""
+        # The key ignores query params: include them before adding
+        # pagination or filtering, or every page will share one entry.
+        #
+        # updated_at comes from the app clock at save time, not commit
+        # order. If two writes to the same user's recipes overlap, the
+        # later commit can carry the older timestamp and leave the key
+        # unchanged; such lists may stay stale for up to
+        # RECIPE_LIST_CACHE_TIMEOUT, which is accepted.
+        stamp = self.get_queryset().aggregate(
+            count=Count("id"),
+            updated_at=Max("updated_at"),
+        )
+        updated_at = stamp["updated_at"]
+        key = "recipes:{}:{}:{}".format(
+            request.user.id,
+            stamp["count"],
+            updated_at.isoformat() if updated_at else "",
+        )
+
+        data = cache.get(key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(key, data, RECIPE_LIST_CACHE_TIMEOUT)
+
+        return Response(data)
 
     def get_serializer_class(self):
         """Return the serializer class for this request"""
@@ -51,7 +91,7 @@ class BaseRecipeAttrViewSet(
 
     def get_queryset(self):
         """Filter queryset to authenticated user"""
-        return self.queryset.filter(user=self.request.user).order_by("-name")
+        return self.queryset.filter(user=self.request.user)
 
 
 class TagViewSet(BaseRecipeAttrViewSet):
@@ -60,10 +100,6 @@ class TagViewSet(BaseRecipeAttrViewSet):
     serializer_class = serializers.TagSerializer
     queryset = Tag.objects.all()
 
-    def get_queryset(self):
-        """Retrieve tags for authenticated user"""
-        return self.queryset.filter(user=self.request.user).order_by("-name")
-
 
 class IngredientViewSet(BaseRecipeAttrViewSet):
     """Manage ingredients in the database"""
@@ -2,7 +2,9 @@
 Tests for the user API
 """
 
-from django.test import TestCase
+from types import MappingProxyType
+
+from django.test import SimpleTestCase, TestCase
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 
@@ -13,95 +15,82 @@ CREATE_USER_URL = reverse("user:create")
 TOKEN_URL = reverse("user:token")
 ME_URL = reverse("user:me")
 
+User = get_user_model()
+
+USER_PAYLOAD = MappingProxyType(
+    {
+        "email": "test@example.com",
+        "name": "Test Name",
+        "password": "testpass123",
+    }
+)
+
 
 def create_user(**params):
     """Create and return a new user"""
-    return get_user_model().objects.create_user(**params)
+    return User.objects.create_user(**params)
 
 
 class PublicUserApiTests(TestCase):
     """Test the public features of the user API"""
 
-    def setUp(self):
-        self.client = APIClient()
-        return super().setUp()
+    client_class = APIClient
 
     def test_create_user_success(self):
         """test creating user is successsful"""
-        payload = {
-            "email": "test@example.com",
-            "name": "Test Name",
-            "password": "testpass123",
-        }
-        res = self.client.post(CREATE_USER_URL, payload)
+        res = self.client.post(CREATE_USER_URL, USER_PAYLOAD)
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
 
-        user = get_user_model().objects.get(email=payload["email"])
-        self.assertTrue(user.check_password(payload["password"]))
+        user = User.objects.only("password").get(email=USER_PAYLOAD["email"])
+        self.assertTrue(user.check_password(USER_PAYLOAD["password"]))
 
         self.assertNotIn("password", res.data)
 
     def test_user_with_email_exists_error(self):
         """Test error returned if user with email exists"""
-        payload = {
-            "email": "test@example.com",
-            "name": "Test Name",
-            "password": "testpass123",
-        }
-
-        create_user(**payload)
-        res = self.client.post(CREATE_USER_URL, payload)
+        create_user(email=USER_PAYLOAD["email"], name=USER_PAYLOAD["name"])
+        res = self.client.post(CREATE_USER_URL, USER_PAYLOAD)
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
 
     def test_password_too_short_error(self):
         """Test error returned if password is less than 5 chars"""
         payload = {
+            **USER_PAYLOAD,
             "email": "shortt@example.com",
-            "name": "Test Name",
             "password": "tw",
         }
 
         res = self.client.post(CREATE_USER_URL, payload)
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
 
-        use_objects = get_user_model().objects
-        user_exists = use_objects.filter(email=payload["email"]).exists()
+        user_exists = User.objects.filter(email=payload["email"]).exists()
         self.assertFalse(user_exists)
 
-    def test_create_token_for_user(self):
-        """Test generates token for vaild credentials"""
-
-        user_details = {
-            "email": "test@example.com",
-            "name": "Test Name",
-            "password": "test-password-123",
-        }
-
-        create_user(**user_details)
+    def test_create_token(self):
+        """Test a token is only generated for valid credentials"""
+        create_user(**USER_PAYLOAD)
 
-        payload = {
-            "email": user_details["email"],
-            "password": user_details["password"],
-        }
+        cases = [
+            (USER_PAYLOAD["password"], status.HTTP_200_OK, True),
+            ("badpass", status.HTTP_400_BAD_REQUEST, False),
+        ]
+        for password, status_code, has_token in cases:
+            with self.subTest(password=password):
+                payload = {
+                    "email": USER_PAYLOAD["email"],
+                    "password": password,
+                }
 
-        res = self.client.post(TOKEN_URL, payload)
+                res = self.client.post(TOKEN_URL, payload)
 
-        self.assertIn("token", res.data)
-        self.assertEqual(res.status_code, status.HTTP_200_OK)
-
-    def test_create_token_bad_credentails(self):
-        """Test return error if credentials are invalid"""
-        create_user(email="test@example.com", password="goodpass")
+                self.assertEqual("token" in res.data, has_token)
+                self.assertEqual(res.status_code, status_code)
 
-        payload = {
-            "email": "test@example.com",
-            "password": "badpass",
-        }
 
-        res = self.client.post(TOKEN_URL, payload)
+class PublicUserApiNoDBTests(SimpleTestCase):
+    """Test the public features of the user API that need no database"""
 
-        self.assertNotIn("token", res.data)
-        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+    client_class = APIClient
 
     def test_create_token_blank_password(self):
         """Test posting blank password return an error"""
@@ -125,20 +114,26 @@ class PublicUserApiTests(TestCase):
 class PrivateUserApiTests(TestCase):
     """Test API requests that require authentication"""
 
-    def setUp(self):
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
         user_details = {
             "email": "user@test.com",
             "name": "Test User",
             "password": "testpass123",
         }
 
-        self.user = create_user(**user_details)
-        self.client = APIClient()
+        cls.user = create_user(**user_details)
+
+    def setUp(self):
         self.client.force_authenticate(user=self.user)
 
     def test_retrieve_profile_success(self):
         """Test retreiving profile for logged in user"""
-        res = self.client.get(ME_URL)
+        # force_authenticate skips the token lookup, so no queries are needed.
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(
@@ -160,7 +155,9 @@ class PrivateUserApiTests(TestCase):
 
         payload = {"name": "Updated name", "password": "newpassword123"}
 
-        res = self.client.patch(ME_URL, payload)
+        # Name and password are saved with a single UPDATE.
+        with self.assertNumQueries(1):
+            res = self.client.patch(ME_URL, payload)
 
         self.user.refresh_from_db()
         self.assertEqual(self.user.name, payload["name"])